@@ -7,18 +7,43 @@ Crawler implementation.
 import datetime
 import json
 import pathlib
+import re
 import shutil
-from typing import Pattern, Union
+import socket
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache, partial
+from types import MappingProxyType
+from typing import Any, Mapping, Pattern, Union
+from urllib.parse import urljoin
 
 import requests
-from bs4 import BeautifulSoup
+import soupsieve
+from bs4 import BeautifulSoup, SoupStrainer
 from bs4.element import Tag
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 from core_utils.article.article import Article
 from core_utils.article.io import to_meta, to_raw
 from core_utils.config_dto import ConfigDTO
 from core_utils.constants import ASSETS_PATH, CRAWLER_CONFIG_PATH
 
+#: Number of requests that are allowed to be in flight at once
+MAX_WORKERS = 16
+
+#: Number of articles that are allowed to be saved at once
+IO_WORKERS = 4
+
+#: Pattern of absolute http(s) URLs
+URL_SCHEME_PATTERN = re.compile(r'^https?://')
+
+#: Restricts seed page parsing to article headers only
+HEADERS_STRAINER = SoupStrainer('h3')
+
+#: Link to an article inside a header of a seed page
+ARTICLE_LINK_SELECTOR = soupsieve.compile('a[href]')
+
 
 class IncorrectSeedURLError(Exception):
     """
@@ -83,6 +108,13 @@ class Config:
         self._should_verify_certificate = data.should_verify_certificate
         self._headless_mode = data.headless_mode
         self._validate_config_content()
+        self._request_kwargs = MappingProxyType({
+            'headers': self._headers,
+            'timeout': self._timeout,
+            'verify': self._should_verify_certificate
+        })
+        self._session: requests.Session | None = None
+        self._session_lock = threading.Lock()
 
     def _extract_config_content(self) -> ConfigDTO:
         """
@@ -102,7 +134,7 @@ class Config:
         if not isinstance(self._seed_urls, list):
             raise IncorrectSeedURLError('incorrect url')
         for url in self._seed_urls:
-            if not isinstance(url, str) or not url.startswith(('http://', 'https://')):
+            if not isinstance(url, str) or not URL_SCHEME_PATTERN.match(url):
                 raise IncorrectSeedURLError('incorrect url')
 
         if not isinstance(self._num_articles, int) or self._num_articles <= 0:
@@ -181,6 +213,47 @@ class Config:
         """
         return self._headless_mode
 
+    def get_request_kwargs(self) -> Mapping[str, Any]:
+        """
+        Retrieve keyword arguments to pass with every request.
+
+        Returns:
+            Mapping[str, Any]: Headers, timeout and certificate verification settings
+        """
+        return self._request_kwargs
+
+    def get_session(self) -> requests.Session:
+        """
+        Retrieve session that keeps connections alive between requests.
+
+        The session is created on the first call and belongs to the caller,
+        which is responsible for closing it.
+
+        Returns:
+            requests.Session: Session with a pooled connection adapter
+        """
+        if self._session is None:
+            with self._session_lock:
+                if self._session is None:
+                    self._session = self._create_session()
+        return self._session
+
+    def _create_session(self) -> requests.Session:
+        """
+        Create session with a connection pool shared by all request workers.
+
+        Returns:
+            requests.Session: Session with a pooled connection adapter
+        """
+        session = requests.Session()
+        retries = Retry(total=3, backoff_factor=0.5, status_forcelist=(500, 502, 503, 504),
+                        raise_on_status=False)
+        adapter = HTTPAdapter(pool_connections=MAX_WORKERS, pool_maxsize=MAX_WORKERS,
+                              max_retries=retries)
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        return session
+
 def make_request(url: str, config: Config) -> requests.models.Response:
     """
     Deliver a response from a request with given configuration.
@@ -192,13 +265,24 @@ def make_request(url: str, config: Config) -> requests.models.Response:
     Returns:
         requests.models.Response: A response from a request
     """
-    request = requests.get(url, headers=config.get_headers(),
-                           timeout=config.get_timeout(),
-                           verify=config.get_verify_certificate())
+    request = config.get_session().get(url, stream=True, **config.get_request_kwargs())
     request.encoding = config.get_encoding()
     return request
 
 
+def is_html_page(response: requests.models.Response) -> bool:
+    """
+    Check whether a response is successful and contains an HTML page.
+
+    Args:
+        response (requests.models.Response): A response from a request
+
+    Returns:
+        bool: Whether the body of the response is worth downloading
+    """
+    return response.ok and 'html' in response.headers.get('Content-Type', '').lower()
+
+
 class Crawler:
     """
     Crawler implementation.
@@ -216,13 +300,16 @@ class Crawler:
         """
         self.config = config
         self.urls = []
+        self._seen_urls: set[str] = set()
+        seed_urls = self.config.get_seed_urls()
+        self._base_url = seed_urls[0] if seed_urls else ''
 
-    def _extract_url(self, article_bs: BeautifulSoup) -> str:
+    def _extract_url(self, article_bs: Tag) -> str:
         """
         Find and retrieve url from HTML.
 
         Args:
-            article_bs (bs4.BeautifulSoup): BeautifulSoup instance
+            article_bs (bs4.element.Tag): Tag with a link to an article
 
         Returns:
             str: Url from HTML
@@ -232,40 +319,36 @@ class Crawler:
             raw_href = raw_href[0]
         if not isinstance(raw_href, str) or not raw_href:
             return ""
-        href: str = raw_href
-
-        if href.startswith(('http://', 'https://')):
-            return href
-
-        seed_list = self.config.get_seed_urls()
-        if not seed_list:
-            return ""
-        base = seed_list[0]
-        parts = base.split('/')
-        domain = parts[0] + '//' + parts[2]
-        return domain + href
+        url = urljoin(self._base_url, raw_href)
+        return url if URL_SCHEME_PATTERN.match(url) else ""
 
     def find_articles(self) -> None:
         """
         Find articles.
         """
-        for seed_url in self.get_search_urls():
-            response = make_request(seed_url, self.config)
-            if not response.ok:
+        with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+            responses = list(executor.map(partial(make_request, config=self.config),
+                                          self.get_search_urls()))
+
+        for response in responses:
+            if len(self.urls) >= self.config.get_num_articles() or not is_html_page(response):
+                response.close()
                 continue
 
-            soup = BeautifulSoup(response.text, 'lxml')
+            soup = BeautifulSoup(response.content, 'lxml', parse_only=HEADERS_STRAINER,
+                                 from_encoding=self.config.get_encoding())
 
             for header in soup.find_all('h3'):
                 if len(self.urls) >= self.config.get_num_articles():
                     break
 
-                a_tag = header.find('a', href=True)
-                if not a_tag:
+                a_tag = ARTICLE_LINK_SELECTOR.select_one(header)
+                if a_tag is None:
                     continue
 
                 url = self._extract_url(a_tag)
-                if url and url not in self.urls:
+                if url and url not in self._seen_urls:
+                    self._seen_urls.add(url)
                     self.urls.append(url)
 
     def get_search_urls(self) -> list:
@@ -283,6 +366,34 @@ class HTMLParser:
     HTMLParser implementation.
     """
 
+    #: Selectors of nested blocks leading to article paragraphs, compiled once for all parsers
+    _text_selectors = (
+        soupsieve.compile('div[itemprop="articleBody"]'),
+        soupsieve.compile('div[class="field ft_html f_content auto_field"]'),
+        soupsieve.compile('div.value'),
+    )
+
+    #: Selectors of meta information containers, keyed by Article field
+    _meta_selectors = {
+        'title': soupsieve.compile('h1'),
+        'date': soupsieve.compile('time'),
+        'topics': soupsieve.compile('ul[itemprop="about"]'),
+        'map': soupsieve.compile('ol.breadcrumb'),
+    }
+
+    #: All meta information containers at once, so that a page is walked a single time
+    _meta_container_selector = soupsieve.compile(
+        ', '.join(selector.pattern for selector in _meta_selectors.values())
+    )
+
+    #: Selector of items of the topics list and of breadcrumbs
+    _list_item_selector = soupsieve.compile('li[itemprop="itemListElement"]')
+
+    #: Selectors of topic names, breadcrumb links and names
+    _topic_name_selector = soupsieve.compile('meta[itemprop="name"]')
+    _crumb_link_selector = soupsieve.compile('a[itemprop="item"]')
+    _name_selector = soupsieve.compile('[itemprop="name"]')
+
     def __init__(self, full_url: str, article_id: int, config: Config) -> None:
         """
         Initialize an instance of the HTMLParser class.
@@ -304,34 +415,47 @@ class HTMLParser:
         Args:
             article_soup (bs4.BeautifulSoup): BeautifulSoup instance
         """
-        body = article_soup.find("div", attrs={"itemprop": "articleBody"})
-        if not isinstance(body, Tag):
-            self.article.text = ""
-            return
-        if not body:
-            self.article.text = ""
-
-        html_field = body.find("div", attrs={"class": "field ft_html f_content auto_field"})
-        if not isinstance(html_field, Tag):
-            self.article.text = ""
-            return
-        if not html_field:
-            self.article.text = ""
-
-        value_div = html_field.find("div", attrs={"class": "value"})
-        if not isinstance(value_div, Tag):
-            self.article.text = ""
-            return
-        if not value_div:
-            self.article.text = ""
-
-        paragraphs = [
-            p.get_text(strip=True)
-            for p in value_div.find_all("p")
-            if p.get_text(strip=True)
-        ]
-
-        self.article.text = "\n".join(paragraphs)
+        value_div: Tag | None = article_soup
+        for selector in self._text_selectors:
+            value_div = selector.select_one(value_div) if value_div is not None else None
+        paragraphs = (p.get_text(strip=True) for p in value_div.find_all("p")) if value_div else ()
+        self.article.text = "\n".join(text for text in paragraphs if text)
+
+    def _find_meta_containers(self, article_soup: BeautifulSoup) -> dict[str, Tag]:
+        """
+        Find containers of meta information in a single pass over the page.
+
+        Args:
+            article_soup (bs4.BeautifulSoup): BeautifulSoup instance
+
+        Returns:
+            dict[str, Tag]: First container found for each Article field
+        """
+        found: dict[str, Tag] = {}
+        for tag in self._meta_container_selector.iselect(article_soup):
+            for field, selector in self._meta_selectors.items():
+                if field not in found and selector.match(tag):
+                    found[field] = tag
+            if len(found) == len(self._meta_selectors):
+                break
+        return found
+
+    def _find_topics(self, about_ul: Tag | None) -> list[str]:
+        """
+        Find topics of article.
+
+        Args:
+            about_ul (Tag | None): List of topics, if present on the page
+
+        Returns:
+            list[str]: Topic names
+        """
+        topics = []
+        for item in self._list_item_selector.select(about_ul) if about_ul else ():
+            meta = self._topic_name_selector.select_one(item)
+            if meta and meta.has_attr('content'):
+                topics.append(str(meta.get('content')).strip())
+        return topics
 
     def _fill_article_with_meta_information(self, article_soup: BeautifulSoup) -> None:
         """
@@ -340,42 +464,29 @@ class HTMLParser:
         Args:
             article_soup (bs4.BeautifulSoup): BeautifulSoup instance
         """
-        h1_tag = article_soup.find('h1')
+        found = self._find_meta_containers(article_soup)
+
+        h1_tag = found.get('title')
         if h1_tag:
             headline_html = h1_tag.decode_contents().strip()
-            fixed = headline_html.replace('«', '&laquo;').replace('»', '&raquo;')
-            self.article.title = fixed
+            self.article.title = headline_html.replace('«', '&laquo;').replace('»', '&raquo;')
         else:
             self.article.title = "NOT FOUND"
 
         self.article.author = ['NOT FOUND']
-        time_tag = article_soup.find('time')
+        time_tag = found.get('date')
         raw_date = time_tag.get_text(strip=True) if time_tag else ''
         self.article.date = self.unify_date_format(raw_date)
-        topics = []
-        about_ul = article_soup.find('ul', itemprop='about')
-        if about_ul:
-            for li in about_ul.find_all('li', itemprop='itemListElement'):
-                meta = li.find('meta', itemprop='name')
-                if meta and meta.has_attr('content'):
-                    topics.append(meta['content'].strip())
-        self.article.topics = topics or ['NOT FOUND']
-
-        bc_ol = article_soup.find("ol", class_="breadcrumb")
-        if bc_ol:
-            crumbs: list[str] = []
-            for li in bc_ol.find_all("li", itemprop="itemListElement"):
-                a = li.find("a", itemprop="item")
-                if isinstance(a, Tag):
-                    name = a.find(attrs={"itemprop": "name"})
-                    crumbs.append(name.get_text(strip=True) if name else a.get_text(strip=True))
-                else:
-                    name = li.find(attrs={"itemprop": "name"})
-                    crumbs.append(name.get_text(strip=True) if name else '')
-            self.article.map = crumbs
-        else:
-            self.article.map = []
+        self.article.topics = self._find_topics(found.get('topics')) or ['NOT FOUND']
 
+        bc_ol = found.get('map')
+        crumbs: list[str] = []
+        for li in self._list_item_selector.select(bc_ol) if bc_ol else ():
+            a = self._crumb_link_selector.select_one(li)
+            name = self._name_selector.select_one(li if a is None else a)
+            fallback = '' if a is None else a.get_text(strip=True)
+            crumbs.append(name.get_text(strip=True) if name else fallback)
+        self.article.map = crumbs
 
     def unify_date_format(self, date_str: str) -> datetime.datetime:
         """
@@ -387,6 +498,12 @@ class HTMLParser:
         Returns:
             datetime.datetime: Datetime object
         """
+        if (len(date_str) == 10 and date_str[2] == date_str[5] == '.' and date_str.isascii()
+                and (date_str[:2] + date_str[3:5] + date_str[6:]).isdigit()):
+            try:
+                return datetime.datetime(int(date_str[6:]), int(date_str[3:5]), int(date_str[:2]))
+            except ValueError:
+                pass
         return datetime.datetime.strptime(date_str, "%d.%m.%Y")
 
     def parse(self) -> Union[Article, bool, list]:
@@ -397,14 +514,14 @@ class HTMLParser:
             Union[Article, bool, list]: Article instance
         """
         response = make_request(self.full_url, self.config)
-        response.encoding = self.config.get_encoding()
 
-        if response.ok:
-            soup = BeautifulSoup(response.text, "lxml")
+        if is_html_page(response):
+            soup = BeautifulSoup(response.content, "lxml",
+                                 from_encoding=self.config.get_encoding())
             self._fill_article_with_text(soup)
             self._fill_article_with_meta_information(soup)
         else:
-            self.article.text = ""
+            response.close()
         return self.article
 
 
@@ -419,20 +536,45 @@ def prepare_environment(base_path: Union[pathlib.Path, str]) -> None:
         shutil.rmtree(base_path)
     base_path.mkdir(parents=True)
 
+
+def install_dns_cache() -> None:
+    """
+    Cache host name resolution so that repeated requests to a host skip DNS lookup.
+    """
+    if hasattr(socket.getaddrinfo, 'cache_info'):
+        return
+    socket.getaddrinfo = lru_cache(maxsize=1024)(socket.getaddrinfo)
+
+
+def save_article(article: Article) -> None:
+    """
+    Save raw text and meta information of an article.
+
+    Args:
+        article (Article): Article instance
+    """
+    to_raw(article)
+    to_meta(article)
+
+
 def main() -> None:
     """
     Entrypoint for scrapper module.
     """
     prepare_environment(ASSETS_PATH)
+    install_dns_cache()
     config = Config(CRAWLER_CONFIG_PATH)
-    crawler = Crawler(config)
-    crawler.find_articles()
-    for idx, url in enumerate(crawler.urls, 1):
-        parser = HTMLParser(url, idx, config)
-        article = parser.parse()
-        if isinstance(article, Article):
-            to_raw(article)
-            to_meta(article)
+    with config.get_session():
+        crawler = Crawler(config)
+        crawler.find_articles()
+        parsers = [HTMLParser(url, idx, config) for idx, url in enumerate(crawler.urls, 1)]
+        with (ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor,
+              ThreadPoolExecutor(max_workers=IO_WORKERS) as io_pool):
+            saved = [io_pool.submit(save_article, article)
+                     for article in executor.map(HTMLParser.parse, parsers)
+                     if isinstance(article, Article)]
+        for future in saved:
+            future.result()
 
 
 if __name__ == "__main__":
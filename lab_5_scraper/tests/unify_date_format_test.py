@@ -0,0 +1,46 @@
+"""
+Date unification validation.
+"""
+
+import datetime
+import unittest
+
+import pytest
+
+from core_utils.constants import CRAWLER_CONFIG_PATH
+from lab_5_scraper.scraper import Config, HTMLParser
+
+
+class UnifyDateFormatTest(unittest.TestCase):
+    """
+    Date unification tests.
+    """
+
+    def setUp(self) -> None:
+        """
+        Define start instructions for UnifyDateFormatTest class.
+        """
+        self.parser = HTMLParser("https://example.com", 1, Config(CRAWLER_CONFIG_PATH))
+
+    @pytest.mark.mark8
+    @pytest.mark.mark10
+    @pytest.mark.stage_2_3_HTML_parser_check
+    @pytest.mark.lab_5_scraper
+    def test_unify_date_format_parses_valid_date(self) -> None:
+        """
+        Ensure that a date in DD.MM.YYYY format is parsed.
+        """
+        expected = datetime.datetime(2024, 2, 1)
+        self.assertEqual(expected, self.parser.unify_date_format("01.02.2024"))
+
+    @pytest.mark.mark8
+    @pytest.mark.mark10
+    @pytest.mark.stage_2_3_HTML_parser_check
+    @pytest.mark.lab_5_scraper
+    def test_unify_date_format_rejects_malformed_dates(self) -> None:
+        """
+        Ensure that dates rejected by strptime are not accepted.
+        """
+        for date_str in ("01.02.20_4", "+1.02.2024", "٠١.٠٢.٢٠٢٤", "01-02-2024", "31.02.2024", ""):
+            with self.subTest(date_str=date_str):
+                self.assertRaises(ValueError, self.parser.unify_date_format, date_str)